@@ -0,0 +1,100 @@
+/*
+ * __COPYRIGHT__
+ *
+ * C implementations of the is_Dict(), is_List() and is_String()
+ * candidates timed by is_types.py, as a reference point for how fast
+ * the predicates could be: the exact-type check is a pointer compare,
+ * subclasses of the built-in type are caught by a flag test on the
+ * object's type, and only a miss on both walks the type's MRO for the
+ * corresponding User* class.
+ *
+ * This is not built automatically.  To compile it in place so that
+ * is_types.py picks it up:
+ *
+ *      cc -shared -fPIC -O2 $(python3-config --includes) \
+ *          -o _is_types_c$(python3-config --extension-suffix) _is_types_c.c
+ */
+
+#define PY_SSIZE_T_CLEAN
+#include <Python.h>
+
+/* The User* classes, looked up once when the module is imported. */
+static PyTypeObject *UserDict = NULL;
+static PyTypeObject *UserList = NULL;
+static PyTypeObject *UserString = NULL;
+
+/*
+ * The User* classes use ABCMeta, so PyObject_IsInstance() would go
+ * through its Python-level __instancecheck__() on every miss.  Walk
+ * the type's MRO directly instead.
+ */
+static PyObject *
+check_subtype(PyObject *e, PyTypeObject *cls)
+{
+    return PyBool_FromLong(PyType_IsSubtype(Py_TYPE(e), cls));
+}
+
+static PyObject *
+is_Dict(PyObject *self, PyObject *e)
+{
+    if (PyDict_CheckExact(e) || PyDict_Check(e))
+        Py_RETURN_TRUE;
+    return check_subtype(e, UserDict);
+}
+
+static PyObject *
+is_List(PyObject *self, PyObject *e)
+{
+    if (PyList_CheckExact(e) || PyList_Check(e))
+        Py_RETURN_TRUE;
+    return check_subtype(e, UserList);
+}
+
+static PyObject *
+is_String(PyObject *self, PyObject *e)
+{
+    if (PyUnicode_CheckExact(e) || PyUnicode_Check(e))
+        Py_RETURN_TRUE;
+    return check_subtype(e, UserString);
+}
+
+static PyMethodDef methods[] = {
+    {"is_Dict", is_Dict, METH_O, "Return whether e is a dict or UserDict."},
+    {"is_List", is_List, METH_O, "Return whether e is a list or UserList."},
+    {"is_String", is_String, METH_O, "Return whether e is a str or UserString."},
+    {NULL, NULL, 0, NULL}
+};
+
+static struct PyModuleDef module = {
+    PyModuleDef_HEAD_INIT,
+    "_is_types_c",
+    "C implementations of the is_types.py candidates.",
+    -1,
+    methods
+};
+
+static PyTypeObject *
+get_type(PyObject *module, const char *name)
+{
+    PyObject *t = PyObject_GetAttrString(module, name);
+    if (t != NULL && !PyType_Check(t)) {
+        PyErr_Format(PyExc_TypeError, "collections.%s is not a class", name);
+        Py_CLEAR(t);
+    }
+    return (PyTypeObject *)t;
+}
+
+PyMODINIT_FUNC
+PyInit__is_types_c(void)
+{
+    PyObject *collections = PyImport_ImportModule("collections");
+    if (collections == NULL)
+        return NULL;
+    UserDict = get_type(collections, "UserDict");
+    UserList = get_type(collections, "UserList");
+    UserString = get_type(collections, "UserString");
+    Py_DECREF(collections);
+    if (UserDict == NULL || UserList == NULL || UserString == NULL)
+        return NULL;
+    return PyModule_Create(&module);
+}
@@ -22,7 +22,10 @@
 #       for i in IterationList:
 #
 # This will allow (as much as possible) us to time just the code itself,
-# not Python function call overhead.
+# not Python function call overhead.  IterationList is a range object
+# (so iterating over it doesn't walk a materialized list), and only its
+# len() is guaranteed, so functions may also loop over something like
+# itertools.repeat(None, len(IterationList)).
 from __future__ import division, print_function
 
 import getopt
@@ -116,7 +119,7 @@ except NameError:
     l = [lvars[f] for f in function_names]
     FunctionList = [f for f in l if isinstance(f, types.FunctionType)]
 
-IterationList = [None] * Iterations
+IterationList = range(Iterations)
 
 def timer(func, *args, **kw):
     results = []
